@@ -6,15 +6,17 @@
 # of enrollment only.  All other use prohibited.
 # Redistribution is prohibited.
 
+from array import array
+
 class DisjointIntegerSets :
     """Disjoint Set Forests of Integers: Representation of disjoint sets.
 
     Disjoint sets of the integers from [0,n) represented as disjoint set forest.
-    This implementation uses both the union by rank heuristic, as well as
+    This implementation uses both the union by size heuristic, as well as
     path compression.
     """
 
-    __slots__ = ["_nodes"]
+    __slots__ = ["_parent", "_size"]
 
     def __init__(self, n) :
         """Initializes disjoint set forest.
@@ -26,46 +28,71 @@ class DisjointIntegerSets :
         n -- number of elements in disjoint set forest.
         """
 
-        self._nodes = [ self.makeset(i) for i in range(n) ]
+        # parallel arrays indexed by element: parent pointer of each element, and
+        # number of elements in the tree rooted at each element (only kept up to date for roots).
+        self._parent = array('i', range(n))
+        self._size = array('i', [1]) * n
 
 
     def makeset(self,x) :
         """Creates a set containing only element x, adding set to forest.
 
-        
+        Does nothing if x is already in the forest.  If x is beyond the integers
+        currently in the forest, any integers in between are also added, each in
+        a set by itself.
+
         Keyword arguments:
-        x -- an element of any hashable type
+        x -- a non-negative integer
         """
-        class _DJSetNode :
-            __slots__ = ['p','rank']
-
-        node = _DJSetNode()
-        node.p = x
-        node.rank = 0
-        return node
+        n = len(self._parent)
+        if x >= n :
+            self._parent.extend(range(n, x + 1))
+            self._size.extend(array('i', [1]) * (x + 1 - n))
         
 
     def union(self,x,y) :
         """Computes the union of the sets containing x and y.
 
-        Uses union by rank heuristic in computing union of sets containing x and y.
-        the "shorter" tree is added as child of "taller" tree.  Though heights are
-        approximate since ranks are upper bounds only.
+        Uses union by size heuristic in computing union of sets containing x and y.
+        The root of the smaller tree (fewer elements) is added as child of the root
+        of the larger tree.
+
+        Returns True if x and y were in different sets (which are now merged),
+        and False if they were already in the same set.
 
         Keyword arguments:
         x -- an element
         y -- an element
         """
-        self._link(self.findset(x), self.findset(y))
+        # the two finds and the link are inlined, rather than calling findset
+        # and a separate link method, since union is called in tight loops
+        parent = self._parent
+        while parent[x] != x :
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        while parent[y] != y :
+            parent[y] = parent[parent[y]]
+            y = parent[y]
+        if x == y :
+            return False
+        # union by size heuristic: attach smaller tree as child of larger tree
+        size = self._size
+        if size[x] < size[y] :
+            parent[x] = y
+            size[y] += size[x]
+        else :
+            parent[y] = x
+            size[x] += size[y]
+        return True
 
 
     def findset(self,x) :
         """Finds the set for a given element, and performs path compression.
 
         Finds the set for a given element, returning the integer at the root of its
-        tree in the forest.  The find also performs path compression, resetting the parents
-        of all nodes along path to root to point directly to root.  Path compression does not
-        reset ranks, thus ranks are upper bounds only.
+        tree in the forest.  The find also performs path compression by path halving,
+        resetting the parent of every other node along the path to root to point to its
+        grandparent.
 
         Returns a representative member of the set, namely the root of the set's tree.
         Subsequent calls to the union method may change which element is root, but otherwise
@@ -74,18 +101,11 @@ class DisjointIntegerSets :
         Keyword arguments:
         x -- the element whose set we want to find
         """
-        # perform path compression during the find
-        if x != self._nodes[x].p :
-            self._nodes[x].p = self.findset(self._nodes[x].p)
-        return self._nodes[x].p
-             
-    def _link(self, x, y) :
-        # union by rank heuristic: attach approximately "shorter" tree as child of approximately "taller" tree
-        if self._nodes[x].rank > self._nodes[y].rank :
-            self._nodes[y].p = x
-        else :
-            self._nodes[x].p = y
-            if self._nodes[x].rank == self._nodes[y].rank :
-                self._nodes[y].rank += 1
+        parent = self._parent
+        # path halving: on the way up, point every other node at its grandparent
+        while parent[x] != x :
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
 
 
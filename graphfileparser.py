@@ -151,11 +151,16 @@
 
 
 from graphshw import WeightedGraph
-from math import radians, cos, sin, sqrt, pi, atan2
+from math import cos, sin, sqrt, pi, asin
+from array import array
+from itertools import islice
 
 
+import mmap
 import sys
 
+_DEG2RAD = pi / 180.0 # multiply by this to convert degrees to radians
+
 def haversine(lat1, lng1, lat2, lng2) :
     """Computes haversine distance between two points in latitude, longitude.
 
@@ -168,17 +173,53 @@ def haversine(lat1, lng1, lat2, lng2) :
     Returns haversine distance in meters.
     """
     R = 6371e3 #radius of the earth in meters
-    phi1 = radians(lat1)
-    phi2 = radians(lat2)
-    deltaPhi = radians((lat2-lat1))
-    deltaLam = radians((lng2-lng1))
+    sinHalfDeltaPhi = sin((lat2-lat1) * _DEG2RAD * 0.5)
+    sinHalfDeltaLam = sin((lng2-lng1) * _DEG2RAD * 0.5)
 
-    a = (sin(deltaPhi/2) * sin(deltaPhi/2)) + ((cos(phi1) * cos(phi2)) * sin(deltaLam/2) * sin(deltaLam/2))
-    c = 2 * atan2(sqrt(a), sqrt(1-a))
+    a = sinHalfDeltaPhi * sinHalfDeltaPhi + cos(lat1 * _DEG2RAD) * cos(lat2 * _DEG2RAD) * sinHalfDeltaLam * sinHalfDeltaLam
+    if a > 1.0 : # rounding can push a just past 1 for nearly antipodal points
+        a = 1.0
+    c = 2 * asin(sqrt(a)) # same as 2 * atan2(sqrt(a), sqrt(1-a)), with one less sqrt
     d = R * c
     return d #Returns the distance in meters
 
 
+def _edgeWeights(lats, lngs, tails, heads, _sin=sin, _cos=cos, _sqrt=sqrt, _asin=asin) :
+    """Computes the haversine weight of every edge in one pass.
+
+    The conversions to radians (halved, as the haversine formula uses
+    half angles) and the cosines of the latitudes are computed once per
+    vertex, rather than once per edge endpoint.  The haversine formula
+    itself is inlined in the loop over the edges, rather than called
+    once per edge, and the math functions are bound as default arguments
+    to make them fast local lookups.  Callers should not pass _sin, _cos,
+    _sqrt, or _asin.
+
+    Keyword Arguments:
+    lats -- latitudes of the vertices, indexed by vertex id
+    lngs -- longitudes of the vertices, indexed by vertex id
+    tails -- the from vertex id of each edge
+    heads -- the to vertex id of each edge, same length as tails
+
+    Returns an array of edge weights in meters, in the same order as the edges.
+    """
+    D = 2 * 6371e3 #diameter of the earth in meters
+    halfDeg2Rad = _DEG2RAD * 0.5
+    halfPhi = [ lat * halfDeg2Rad for lat in lats ]
+    cosPhi = [ _cos(lat * _DEG2RAD) for lat in lats ]
+    halfLam = [ lng * halfDeg2Rad for lng in lngs ]
+
+    weights = array('d', [0.0]) * len(tails)
+    for i, (u, v) in enumerate(zip(tails, heads)) :
+        sinHalfDeltaPhi = _sin(halfPhi[v] - halfPhi[u])
+        sinHalfDeltaLam = _sin(halfLam[v] - halfLam[u])
+        a = sinHalfDeltaPhi * sinHalfDeltaPhi + cosPhi[u] * cosPhi[v] * sinHalfDeltaLam * sinHalfDeltaLam
+        if a > 1.0 : # rounding can push a just past 1 for nearly antipodal points
+            a = 1.0
+        weights[i] = D * _asin(_sqrt(a))
+    return weights
+
+
 def parseHighwayGraphFile(filename) :
     """Parses a highway graph file and return a WeightedGraph
     representing a highway graph.
@@ -188,47 +229,36 @@ def parseHighwayGraphFile(filename) :
     graph data relative to the current working directory.
     """
 
-    file = open(filename)
-    count = 0
-    vertex = []
-
-    weights = []
-    edgeData = []
-
-    while True: #READS LINES
-        count += 1
-        line = file.readline()
-        if line == "":
-            file.close()
-            break
-        if count == 2: # uses second line for vertex and edge numbers
-            vertexNum,edgeNum = line.split()
-            size = int(vertexNum)
-            edgeSize = int(edgeNum)
-
-
-
-            #May need to be offset
-        if count >= 3 : #needed or else the statement will run on the first line and second line
-
-            #This reads the latitude and longitude data
-            if (count <= size + 2) and (count != size + 3):
-               a0, a1, a2 = line.split()
-               v = (float(a1), float(a2))
-               vertex.append(v)
+    # The file is memory mapped and read as bytes, since the vertex and edge blocks
+    # are tokenized without decoding, and float() and int() accept bytes.
+    with open(filename, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm :
+        lines = iter(mm.readline, b"")
+        next(lines) # first line is the header: TMG 1.0 simple
+        size, edgeSize = map(int, next(lines).split()) # second line has number of vertices and edges
 
-                #Maybe Add the verticese data to the verticese list, then read the data at the list[p] section
-                #where p = the specified vertices by a(o) and (a1)
+        # next size lines are the vertices: StringID latitude longitude
+        # The whole block is read and tokenized at once, so every 3rd token
+        # starting at 1 is a latitude, and starting at 2 is a longitude.
+        tokens = b"".join(islice(lines, size)).split()
+        lats = array('d', map(float, tokens[1::3]))
+        lngs = array('d', map(float, tokens[2::3]))
 
-            if  count > size + 2 and line != "":
-                a0, a1, a2 = line.split()
-                edge= (int(a0), int(a1))
-                lat1, lng1 = vertex[int(a0)]
-                lat2, lng2 = vertex[int(a1)]
-                weights.append(haversine(lat1, lng1, lat2, lng2))
-                edgeData.append(edge)
+        # next edgeSize lines are the edges: from to label
+        # Only the first two fields are needed, so each line is split at most twice,
+        # which also leaves the label in one piece if it happens to contain spaces.
+        # The endpoints are kept in two flat columns rather than a list of pairs.
+        # The columns are appended to, rather than preallocated, so that a file with
+        # fewer edge lines than its header says gives just the edges it has.
+        tails = array('i')
+        heads = array('i')
+        for line in islice(lines, edgeSize) :
+            a0, a1, a2 = line.split(None, 2)
+            tails.append(int(a0))
+            heads.append(int(a1))
 
-    graph = WeightedGraph(size, edgeData, weights)
+    # all of the weights are computed in one pass once every vertex is known
+    weights = _edgeWeights(lats, lngs, tails, heads)
+    graph = WeightedGraph(size, zip(tails, heads), weights)
 
 
 
@@ -259,26 +289,18 @@ def parseHighwayGraphFile(filename) :
 
 
 if __name__ == "__main__":
-    p = 0
-    i = 0 #this is the counter to ensure that the correct arg is used (I tried it withp
-
-
-for arg in sys.argv:
-        if i != 0:
-            graph = parseHighwayGraphFile(str(sys.argv[i]))
-            print("")
-            print("This is to test haversine with constant values")
-            print("haversine(53, 32, 56, 42)   *This is an example of the function*")
-            print(haversine(53, 32, 56, 42))
-
-            print("")
-            print("This is to show the degree of the first 15 vertexes in the graph.")
-            while p < graph.numVertices():  # I have over close to 1500 vertexes and didn't want to overdo it with the output
-                print(graph.degree(p))
-                p = p +1
-            print
-            i = i +1
-        i = i+1
+    print("")
+    print("This is to test haversine with constant values")
+    print("haversine(53, 32, 56, 42)   *This is an example of the function*")
+    print(haversine(53, 32, 56, 42))
+
+    for filename in sys.argv[1:] :
+        graph = parseHighwayGraphFile(filename)
+
+        print("")
+        print("This is to show the degree of each vertex in " + filename + " (vertex id, then degree).")
+        # one write for the whole table, rather than one print call per vertex
+        sys.stdout.write("\n".join(f"{v} {graph.degree(v)}" for v in range(graph.numVertices())) + "\n")
 
 
 
@@ -1,5 +1,10 @@
+from array import array
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import heapq
 import math
+import os
+from operator import itemgetter
 from disjointset import DisjointIntegerSets
 from intpq import PQInts
 
@@ -16,8 +21,12 @@ class Graph :
         edges - any iterable of ordered pairs indicating the edges 
         """
         self._adj = [ _AdjacencyList() for i in range(v) ]
-        for u, v in edges :
-            self.addEdge(u, v)
+        # Append straight to the storage of each adjacency list, rather than
+        # going through addEdge (and then add) once per edge.
+        adjacent = [ adjList._vertices for adjList in self._adj ]
+        for a, b in edges :
+            adjacent[a].append(b)
+            adjacent[b].append(a)
         
     def addEdge(self, a, b) :
         """Adds an edge to the graph.
@@ -39,7 +48,7 @@ class Graph :
         Keyword arguments:
         vertex - integer id of vertex
         """        
-        return self._adj[vertex]._size
+        return len(self._adj[vertex])
 
     def bfs(self, s) :
         """Performs a BFS of the graph from a specified starting vertex.
@@ -50,24 +59,68 @@ class Graph :
         s - the integer id of the starting vertex.
         """
         
-        class VertexData :
-            __slots__ = [ 'd', 'pred' ]
-
-            def __init__(self) :
-                self.d = math.inf
-                self.pred = None
+        # distances and predecessors are kept in parallel lists while searching,
+        # and only wrapped in per-vertex objects at the end.  Unreached vertices have
+        # distance -1 while searching, so that all comparisons are between ints, and
+        # are given distance math.inf at the end.
+        d = [ -1 ] * self.numVertices()
+        pred = [ None ] * self.numVertices()
+        d[s] = 0
+        # attributes used in the loops are bound to locals once
+        adj = self._adj
+        # level synchronous: expand the whole frontier at distance level - 1 at once,
+        # which visits vertices in the same order as a FIFO queue would
+        frontier = [s]
+        level = 0
+        while len(frontier) > 0 :
+            level += 1
+            nextFrontier = []
+            append = nextFrontier.append
+            for u in frontier :
+                for v in adj[u] :
+                    if d[v] < 0 :
+                        d[v] = level
+                        pred[v] = u
+                        append(v)
+            frontier = nextFrontier
+        if -1 in d :
+            inf = math.inf
+            d = [ x if x >= 0 else inf for x in d ]
+        return list(map(_BFSVertexData, d, pred))
+
+    def allPairsBfs(self) :
+        """Computes the BFS distance from every vertex to every other vertex.
+        Returns a list of lists, such that element [s][v] is the distance from s to v
+        (math.inf if v is unreachable from s).  Predecessors are not kept.
+        """
 
-        vertices = [VertexData() for i in range(self.numVertices())]
-        vertices[s].d = 0
-        q = deque([s])
-        while len(q) > 0 :
-            u = q.popleft()
-            for v in self._adj[u] :
-                if vertices[v].d == math.inf :
-                    vertices[v].d = vertices[u].d + 1
-                    vertices[v].pred = u
-                    q.append(v)
-        return vertices
+        # Rather than calling bfs once per source, the buffers that don't need to
+        # outlive a search are allocated once and reused by every search.  Each
+        # distance row is a copy of a prebuilt row of math.inf, which is a single
+        # block copy rather than building a new list element by element.
+        adj = self._adj
+        inf = math.inf
+        unreached = [ inf ] * self.numVertices()
+        frontier = []
+        nextFrontier = []
+        rows = []
+        for s in range(self.numVertices()) :
+            d = unreached[:]
+            d[s] = 0
+            frontier.append(s)
+            level = 0
+            while len(frontier) > 0 :
+                level += 1
+                append = nextFrontier.append
+                for u in frontier :
+                    for v in adj[u] :
+                        if d[v] == inf :
+                            d[v] = level
+                            append(v)
+                frontier, nextFrontier = nextFrontier, frontier
+                nextFrontier.clear()
+            rows.append(d)
+        return rows
 
     def dfs(self, onFinish=lambda v : None) :
         """Performs a DFS of the graph.  Returns a list of objects, one per vertex, containing
@@ -75,34 +128,37 @@ class Graph :
         produced by the search (pred).
         """
 
-        class VertexData :
-            __slots__ = [ 'd', 'f', 'pred' ]
-
-            def __init__(self) :
-                self.d = 0
-                self.pred = None
-
-        vertices = [VertexData() for i in range(self.numVertices())]
+        # discovery times, finish times, and predecessors are kept in parallel lists
+        # while searching, and only wrapped in per-vertex objects at the end
+        d = [ 0 ] * self.numVertices()
+        f = [ 0 ] * self.numVertices()
+        pred = [ None ] * self.numVertices()
         time = 0
-
-        def dfs_visit(u) :
-            nonlocal time
-            nonlocal vertices
-
-            time = time + 1
-            vertices[u].d = time
-            for v in self._adj[u] :
-                if vertices[v].d == 0 :
-                    vertices[v].pred = u
-                    dfs_visit(v)
-            time = time + 1
-            vertices[u].f = time
-            onFinish(u)
-
-        for u in range(len(vertices)) :
-            if vertices[u].d == 0 :
-                dfs_visit(u)
-        return vertices
+        adj = self._adj
+
+        for r in range(len(d)) :
+            if d[r] == 0 :
+                time = time + 1
+                d[r] = time
+                # Explicit stack instead of recursion.  Each entry is a vertex along with
+                # the iterator over its adjacent vertices, so that the scan of its
+                # adjacency list resumes where it left off when the vertex is back on top.
+                stack = [ (r, iter(adj[r])) ]
+                while len(stack) > 0 :
+                    u, adjacent = stack[-1]
+                    for v in adjacent :
+                        if d[v] == 0 :
+                            pred[v] = u
+                            time = time + 1
+                            d[v] = time
+                            stack.append((v, iter(adj[v])))
+                            break
+                    else :
+                        stack.pop()
+                        time = time + 1
+                        f[u] = time
+                        onFinish(u)
+        return list(map(_DFSVertexData, d, f, pred))
 
     def getEdgeList(self) :
         """Returns a list of the edges of the graph
@@ -112,6 +168,51 @@ class Graph :
         """
         return [ (u,v) for u, uList in enumerate(self._adj) for v in uList if v > u]
 
+    def applyPermutation(self, perm) :
+        """Relabels the vertices of the graph.
+
+        Keyword arguments:
+        perm - a list containing each vertex id exactly once, such that vertex perm[i]
+        of the graph becomes vertex i
+        """
+        newId = [ 0 ] * len(perm)
+        for i, u in enumerate(perm) :
+            newId[u] = i
+        self._adj = [ self._adj[u]._relabeled(newId) for u in perm ]
+
+    def reorderRCM(self) :
+        """Relabels the vertices of the graph in Reverse Cuthill-McKee (RCM) order.
+
+        RCM numbers the vertices in breadth first order, visiting the adjacent
+        vertices of each vertex in increasing order of degree, starting each
+        connected component from a vertex of minimum degree, and then reverses that
+        order.  Adjacent vertices end up with nearby ids, so subsequent traversals
+        of the graph access the adjacency lists in a more cache friendly pattern.
+
+        Returns the permutation that was applied, a list perm such that
+        vertex i of the relabeled graph was vertex perm[i] before.
+        """
+        n = self.numVertices()
+        degree = [ len(adjList) for adjList in self._adj ]
+        visited = [ False ] * n
+        order = []
+        for s in sorted(range(n), key=degree.__getitem__) :
+            if not visited[s] :
+                visited[s] = True
+                head = len(order)
+                order.append(s)
+                # order doubles as the BFS queue, with head the index of the front
+                while head < len(order) :
+                    u = order[head]
+                    head += 1
+                    for v in sorted(self._adj[u], key=degree.__getitem__) :
+                        if not visited[v] :
+                            visited[v] = True
+                            order.append(v)
+        order.reverse()
+        self.applyPermutation(order)
+        return order
+
 class WeightedGraph(Graph) :
     """Weighted graph represented with adjacency lists."""
 
@@ -133,9 +234,17 @@ class WeightedGraph(Graph) :
 
         """
         self._adj = [ _WeightedAdjacencyList() for i in range(v) ]
-        for i, (u,v) in enumerate(edges) :
-
-            self.addEdge(u, v, weights[i])
+        # filled directly, as in Graph.__init__
+        adjacent = [ adjList._vertices for adjList in self._adj ]
+        adjacentWeights = [ adjList._weights for adjList in self._adj ]
+        # weights is indexed rather than zipped with edges, so that a weights list
+        # shorter than edges raises an IndexError rather than silently dropping edges
+        for i, (a, b) in enumerate(edges) :
+            w = weights[i]
+            adjacent[a].append(b)
+            adjacentWeights[a].append(w)
+            adjacent[b].append(a)
+            adjacentWeights[b].append(w)
                 
     def addEdge(self, a, b, w=1) :
         """Adds an edge to the graph.
@@ -162,7 +271,7 @@ class WeightedGraph(Graph) :
         if not withWeights :
             return super().getEdgeList()
         else :
-            return [ ((u,v),w) for u, uList in enumerate(self._adj) for v, w in uList.__iter__(True) if v > u]
+            return [ ((u,v),w) for u, uList in enumerate(self._adj) for v, w in uList.iterWeighted() if v > u]
 
     def mstKruskal(self) :
         """Returns the set of edges in some
@@ -173,11 +282,13 @@ class WeightedGraph(Graph) :
         A = set()
         forest = DisjointIntegerSets(self.numVertices())
         edges = self.getEdgeList(True)
-        edges.sort(key=lambda x : x[1])
+        edges.sort(key=itemgetter(1))
+        union = forest.union
+        add = A.add
         for (u,v), w in edges :
-            if forest.findset(u) != forest.findset(v) :
-                A.add((u,v))
-                forest.union(u,v)
+            # union returns False if u and v were already in the same tree
+            if union(u,v) :
+                add((u,v))
         return A
 
     def mstPrim(self, r=0) :
@@ -190,118 +301,133 @@ class WeightedGraph(Graph) :
         """
 
         parent = [ None for x in range(self.numVertices())]
+        # dist mirrors each vertex's priority in Q, and visited[u] is True once u has
+        # been extracted from Q, so the inner loop can test plain lists rather than
+        # calling Q.contains and Q.getPriority
+        dist = [ math.inf ] * self.numVertices()
+        dist[r] = 0
+        visited = [ False ] * self.numVertices()
         Q = PQInts(self.numVertices())
-        Q.insert(r, 0)
-        for u in range(self.numVertices()) :
-            if u != r :
-                Q.insert(u, math.inf)
-        while not Q.isEmpty() :
-            u = Q.extractMin()
-            for v, w in self._adj[u].__iter__(True) :
-                if Q.contains(v) and w < Q.getPriority(v) :
+        # one batch insert (a single heapify) rather than one insert per vertex
+        Q.insertAll(list(enumerate(dist)))
+        # the PQ's methods and the adjacency lists are bound to locals once
+        adj = self._adj
+        isEmpty, extractMin, changePriority = Q.isEmpty, Q.extractMin, Q.changePriority
+        while not isEmpty() :
+            u = extractMin()
+            visited[u] = True
+            for v, w in adj[u].iterWeighted() :
+                if not visited[v] and w < dist[v] :
+                    dist[v] = w
                     parent[v] = u
-                    Q.changePriority(v, w)
+                    changePriority(v, w)
         return { (u,v) for v, u in enumerate(parent) if u != None}
 
     def bellmanFord(self,s) :
         """Bellman Ford Algorithm for single source shortest path.
 
+        Implemented as the queue-based variant (sometimes called SPFA):
+        rather than relaxing every edge in each of V-1 passes, only the
+        edges leaving a vertex whose distance has changed are relaxed,
+        using a FIFO queue of such vertices.  A vertex entering the queue
+        V times means there is a negative weight cycle reachable from s.
+
+        Returns an empty list if there is a negative weight cycle reachable
+        from s.  Otherwise returns a list of 3-tuples, one for each vertex,
+        such that first position is vertex id, second is distance from
+        source vertex (math.inf if unreachable), and third is the vertex's
+        parent (None for the source and unreachable vertices).
+
         Keyword Arguments:
         s - The source vertex.
         """
-
-        # Programming Assignment 3:
-        # 1) Implement Bellman Ford Algorithm.
-        #
-        #    If there are negative weight cycles,
-        #    have this method return an empty list
-        #    (instead of the False from the pseudocode).
-        #
-        #    If there are no negative weight cycles, then
-        #    have this method return a list of 3-tuples,
-        #    one for each vertex, such that first position
-        #    is vertex id, second is distance from source
-        #    vertex (i.e., what pseudocode from textbook refers
-        #    to as v.d), and third is the vertex's parent (what
-        #    the textbook refers to as v.pi).  E.g., (2, 10, 5)
-        #    would mean the shortest path from s to 2 has weight 10,
-        #    and vertex 2's parent is vertex 5.
-        #
-        #    The parameter s is the source vertex.
-        #
-        # Useful Hint (for both parts 1 and 2):
-        #  The loops of lines 3 and 5 of the pseudocode for
-        #  Bellman Ford iterate over the edges of the graph.
-        #  You will also need the weights.  The adjacency list
-        #  class has two iterators, one that gives you the weights
-        #  and one that doesn't.  To implement the iteration over the
-        #  edges, you will actually need a pair of nested loops, one
-        #  over the vertices u, and then one over the edges that
-        #  start at u (along with the weights of those edges). 
-        #  To iterate over the vertices adjacent to u, and
-        #  get the weight associated with each edge, you can do:
-        #  for v, w in self._adj[u].__iter__(True)
-        #  You don't normally call methods that start with __ directly.
-        #  Python's for loops call that method to control how many
-        #  times to iterate when iterating over a collection like a list.
-        #  I provided an optional parameter to that method, which when
-        #  passed True, gives you the adjacent vertices and the edge weights.
-        #  Or you can also feel free to use the getEdgeList method
-        #  to get a list of the edges with weights.  If you do that,
-        #  then you'll just need a pair of nested loops.
-        #
-        #  Important Hint: In the pseudocode of Bellman Ford, the pair
-        #  of nested loops will become a triple
-        #  of nested loops in your Python code.  This is because
-        #  you need a pair of nested loops to iterate
-        #  over the edges, and that will itself be within another
-        #  loop (the outer loop from the pseudocode).
-        #  Don't forget about that outer loop.  If you leave it out,
-        #  you won't get the actual shortest paths,
-        #  and when you time your code in part 3, your times will
-        #  be significantly off from what they should be.
-        #  Although if you do use my getEdgeList method then you really
-        #  will only need a pair of nested loops.
-        #
-        #  When you get to part 2 later, when you implement Dijkstra's
-        #  algorithm, you will need to do a similar
-        #  thing (line 7 of the pseduocode of Dijkstra's algorithm).
-        #  Only there you'll just iterate over the
-        #  vertices adjacent to u, and not all of the edges.
-        #  So the getEdgeList method will be completely irrelevant to you
-        #  for Dijkstra's algorithm.
-        pass
+        n = self.numVertices()
+        dist = [ math.inf ] * n
+        pred = [ None ] * n
+        inQueue = [ False ] * n
+        enqueueCount = [ 0 ] * n
+        dist[s] = 0
+        q = deque([s])
+        inQueue[s] = True
+        enqueueCount[s] = 1
+        adj = self._adj
+        popleft, append = q.popleft, q.append
+        while len(q) > 0 :
+            u = popleft()
+            inQueue[u] = False
+            du = dist[u]
+            for v, w in adj[u].iterWeighted() :
+                if du + w < dist[v] :
+                    dist[v] = du + w
+                    pred[v] = u
+                    if not inQueue[v] :
+                        enqueueCount[v] += 1
+                        if enqueueCount[v] >= n :
+                            return []
+                        inQueue[v] = True
+                        append(v)
+        return list(zip(range(n), dist, pred))
 
     def dijkstra(self,s) :
         """Dijkstra's Algorithm using a binary heap as the PQ.
 
+        The PQ is a heapq list of (distance, vertex) pairs.  Rather than
+        decreasing a vertex's priority, each shorter distance found is
+        pushed as a new pair, and pairs that are out of date (longer than
+        the vertex's current distance) are skipped when popped.
+        Edge weights must be non-negative.
+
+        Returns a list of 3-tuples, one for each vertex, such that first
+        position is vertex id, second is distance from source vertex
+        (math.inf if unreachable), and third is the vertex's parent
+        (None for the source and unreachable vertices).  E.g., (2, 10, 5)
+        would mean the shortest path from s to 2 has weight 10,
+        and vertex 2's parent is vertex 5.
+
         Keyword Arguments:
         s - The source vertex.
         """
+        n = self.numVertices()
+        dist = [ math.inf ] * n
+        pred = [ None ] * n
+        dist[s] = 0
+        pq = [ (0, s) ]
+        adj = self._adj
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while len(pq) > 0 :
+            d, u = heappop(pq)
+            if d > dist[u] :
+                continue # out of date entry, u was already finished
+            for v, w in adj[u].iterWeighted() :
+                nd = d + w
+                if nd < dist[v] :
+                    dist[v] = nd
+                    pred[v] = u
+                    heappush(pq, (nd, v))
+        return list(zip(range(n), dist, pred))
+
+    def allPairsDijkstra(self, workers=None) :
+        """Runs Dijkstra's Algorithm from every vertex, in parallel in a pool of processes.
+        Returns a list, with one element per source vertex s, which is the list
+        returned by dijkstra(s).  Edge weights must be non-negative.
+
+        Each worker process receives the graph once, when it starts, rather than
+        with each source vertex it is given.  With only one worker, or no more
+        vertices than workers, dijkstra is simply called from each vertex in this
+        process, since starting the pool would cost more than it saves.
 
-        # Programming Assignment 3:
-        # 2) Implement Dijkstra's Algorithm using a binary heap
-        #    implementation of a PQ as the PQ.
-        #    Specifically, use the PQInts class from the intpq.py
-        #    that I have provided.  You can see examples of its usage
-        #    above in the implementation of Prim's algorithm.
-        #
-        #    Have this method return a list of 3-tuples, one for
-        #    each vertex, such that first position is vertex id,
-        #    second is distance from source vertex (i.e., what
-        #    pseudocode from textbook refers to as v.d), and third
-        #    is the vertex's parent (what the textbook refers to
-        #    as v.pi).  E.g., (2, 10, 5) would mean the shortest path
-        #    from s to 2 has weight 10, and vertex 2's parent is vertex 5.
-        #
-        #    The parameter s is the source vertex.
-        #
-        #    Whenever you need to change the value of d for a
-        #    vertex, don't forget to also call the appropriate
-        #    method from the PQInts class to decrease that vertex's
-        #    priority.  Your implementation will be incorrect if you
-        #    forget to update priorities.
-        pass
+        Keyword Arguments:
+        workers - number of worker processes (default is the number of CPUs).
+        """
+        if workers is None :
+            workers = os.cpu_count() or 1
+        n = self.numVertices()
+        if workers <= 1 or n <= workers :
+            return [ self.dijkstra(s) for s in range(n) ]
+        # sources are handed out in chunks to cut down on interprocess communication
+        chunk = max(1, n // (4 * workers))
+        with ProcessPoolExecutor(workers, initializer=_initDijkstraWorker, initargs=(self,)) as pool :
+            return list(pool.map(_dijkstraWorker, range(n), chunksize=chunk))
 
 class Digraph(Graph) :
     """Digraph represented with adjacency lists."""
@@ -309,10 +435,14 @@ class Digraph(Graph) :
     __slots__ = [ '_inDegree' ]
 
     def __init__(self, v=10, edges=[]) :
-        self._inDegree = [ 0 for i in range(v) ]
+        inDegree = [ 0 ] * v
         self._adj = [ _AdjacencyList() for i in range(v) ]
-        for u, v in edges :
-            self.addEdge(u, v)
+        # filled directly, as in Graph.__init__
+        adjacent = [ adjList._vertices for adjList in self._adj ]
+        for a, b in edges :
+            adjacent[a].append(b)
+            inDegree[b] += 1
+        self._inDegree = inDegree
         
     def addEdge(self, a, b) :
         """Adds a directed edge to the graph.
@@ -353,50 +483,82 @@ class Digraph(Graph) :
         """
         return [ (u,v) for u, uList in enumerate(self._adj) for v in uList]
 
+    def applyPermutation(self, perm) :
+        """Relabels the vertices of the graph.
+
+        Keyword arguments:
+        perm - a list containing each vertex id exactly once, such that vertex perm[i]
+        of the graph becomes vertex i
+        """
+        super().applyPermutation(perm)
+        self._inDegree = [ self._inDegree[u] for u in perm ]
+
     def transpose(self) :
         """Generates and returns the transpose of this Digraph."""
         T = Digraph(self.numVertices())
-        for u, adjacent in enumerate(self._adj) :
-            for v in adjacent :
-                T.addEdge(v, u)
+        # filled directly rather than with addEdge, as in __init__.  The indegree
+        # of a vertex in the transpose is its outdegree here, so it isn't counted.
+        adjacent = [ adjList._vertices for adjList in T._adj ]
+        for u, uList in enumerate(self._adj) :
+            for v in uList :
+                adjacent[v].append(u)
+        T._inDegree = [ len(uList) for uList in self._adj ]
         return T
 
     def topologicalSort(self) :
-        """Topological Sort of the directed graph (Section 22.4 from textbook).
+        """Topological Sort of the directed graph, using Kahn's algorithm.
+        Repeatedly removes a vertex with no remaining incoming edges,
+        rather than ordering by DFS finishing times (Section 22.4 from textbook).
         Returns the topological sort as a list of vertex indices.
+        If the digraph has a cycle, the list is missing the vertices
+        on or reachable from a cycle.
         """
-        topSort = []
-        def onFinish(u) :
-            nonlocal topSort
-            topSort.append(u)
-        self.dfs(onFinish)
-        topSort.reverse()
-        return topSort
+        indeg = self._inDegree[:]
+        q = deque(u for u, d in enumerate(indeg) if d == 0)
+        order = []
+        adj = self._adj
+        while len(q) > 0 :
+            u = q.popleft()
+            order.append(u)
+            for v in adj[u] :
+                indeg[v] -= 1
+                if indeg[v] == 0 :
+                    q.append(v)
+        return order
+
+    def _dfsFinishOrder(self) :
+        """Returns the vertices in decreasing order of DFS finishing time.
+        Unlike topologicalSort, this is defined even if the digraph has cycles."""
+        finished = []
+        self.dfs(finished.append)
+        finished.reverse()
+        return finished
 
     def scc(self) :
         """Computes the strongly connected components of a digraph.
         Returns a list of sets, containing one set for each
         strongly connected component,
         which is simply a set of the vertices in that component."""
-        ordered = self.topologicalSort()
+        ordered = self._dfsFinishOrder()
         T = self.transpose()
         
         discovered = [ False for i in range(T.numVertices())]
-        def dfs_visit(u, component) :
-            nonlocal discovered
-            nonlocal T
-
-            discovered[u] = True
-            component.add(u)
-            for v in T._adj[u] :
-                if not discovered[v] :
-                    dfs_visit(v, component)
-
+        TAdj = T._adj
         SCC = []
         for u in ordered :
             if not discovered[u] :
-                component = set()
-                dfs_visit(u, component)
+                # only membership matters here, not discovery order, so a plain
+                # stack of vertices (rather than recursion) is enough
+                discovered[u] = True
+                component = {u}
+                stack = [u]
+                while len(stack) > 0 :
+                    x = stack.pop()
+                    for v in TAdj[x] :
+                        if not discovered[v] :
+                            discovered[v] = True
+                            component.add(v)
+                            stack.append(v)
                 SCC.append(component)
         return SCC
 
@@ -411,9 +573,17 @@ class WeightedDigraph(WeightedGraph,Digraph) :
         edges - any iterable of ordered pairs indicating the edges 
         weights - list of weights, same length as edges list
         """
+        inDegree = [ 0 ] * v
         self._adj = [ _WeightedAdjacencyList() for i in range(v) ]
-        for i, (u,v) in enumerate(edges) :
-            self.addEdge(u, v, weights[i])
+        # as in WeightedGraph.__init__
+        adjacent = [ adjList._vertices for adjList in self._adj ]
+        adjacentWeights = [ adjList._weights for adjList in self._adj ]
+        for i, (a, b) in enumerate(edges) :
+            w = weights[i]
+            adjacent[a].append(b)
+            adjacentWeights[a].append(w)
+            inDegree[b] += 1
+        self._inDegree = inDegree
         
     def addEdge(self, a, b, w=1) :
         """Adds an edge to the graph.
@@ -423,6 +593,7 @@ class WeightedDigraph(WeightedGraph,Digraph) :
         b - target (ending) vertex
         """
         self._adj[a].add(b, w)
+        self._inDegree[b] += 1
 
     def degree(self, vertex) :
         return Digraph.degree(self, vertex)
@@ -442,101 +613,95 @@ class WeightedDigraph(WeightedGraph,Digraph) :
         if not withWeights :
             return super().getEdgeList()
         else :
-            return [ ((u,v),w) for u, uList in enumerate(self._adj) for v, w in uList.__iter__(True)]
+            return [ ((u,v),w) for u, uList in enumerate(self._adj) for v, w in uList.iterWeighted()]
      
     def transpose(self) :
         """Generates and returns the transpose of this Digraph."""
         T = WeightedDigraph(self.numVertices())
-        for u, adjacent in enumerate(self._adj) :
-            for v, w in adjacent.__iter__(True) :
-                T.addEdge(v, u, w)
+        # filled directly, as in Digraph.transpose
+        adjacent = [ adjList._vertices for adjList in T._adj ]
+        adjacentWeights = [ adjList._weights for adjList in T._adj ]
+        for u, uList in enumerate(self._adj) :
+            for v, w in uList.iterWeighted() :
+                adjacent[v].append(u)
+                adjacentWeights[v].append(w)
+        T._inDegree = [ len(uList) for uList in self._adj ]
         return T
 
-class _AdjacencyList :
+# The graph of the current worker process of WeightedGraph.allPairsDijkstra,
+# set once by the pool's initializer.
+_workerGraph = None
 
-    __slots__ = [ '_first', '_last', '_size']
+def _initDijkstraWorker(graph) :
+    global _workerGraph
+    _workerGraph = graph
 
-    def __init__(self) :
-        self._first = self._last = None
-        self._size = 0
+def _dijkstraWorker(s) :
+    return _workerGraph.dijkstra(s)
 
-    def add(self, vertex) :
-        self._add(_AdjListNode(vertex))
-        
-    def _add(self, listNode) :
-        if self._first == None :
-            self._first = self._last = listNode
-        else :
-            self._last._next = listNode
-            self._last = self._last._next
-        self._size += 1
+class _BFSVertexData :
 
-    def __iter__(self):
-        return _AdjListIter(self)    
+    __slots__ = [ 'd', 'pred' ]
 
-class _WeightedAdjacencyList(_AdjacencyList) :
+    def __init__(self, d, pred) :
+        self.d = d
+        self.pred = pred
 
-    __slots__ = []
+class _DFSVertexData :
 
-    def __init__(self) :
-        super().__init__()
+    __slots__ = [ 'd', 'f', 'pred' ]
 
-    def add(self, vertex, w=1) :
-        self._add(_WeightedAdjListNode(vertex, w))
+    def __init__(self, d, f, pred) :
+        self.d = d
+        self.f = f
+        self.pred = pred
 
-    def __iter__(self, weighted=False):
-        if weighted :
-            return _AdjListIterWithWeights(self)
-        else :
-            return _AdjListIter(self)    
-    
-class _AdjListNode :
+class _AdjacencyList :
+
+    # The adjacent vertices are stored contiguously in an array of machine
+    # ints, rather than as a linked list of node objects.
+    __slots__ = [ '_vertices' ]
+
+    def __init__(self) :
+        self._vertices = array('i')
 
-    __slots__ = [ '_next', '_targetVertex' ]
+    def add(self, vertex) :
+        self._vertices.append(vertex)
 
-    def __init__(self, vertex) :
-        self._next = None
-        self._targetVertex = vertex
+    def __len__(self) :
+        return len(self._vertices)
 
-class _WeightedAdjListNode(_AdjListNode) :
+    def __iter__(self):
+        return iter(self._vertices)
 
-    __slots__ = [ '_w' ]
+    def _relabeled(self, newId) :
+        # copy of this list with each adjacent vertex v replaced by newId[v]
+        relabeled = type(self)()
+        relabeled._vertices = array('i', map(newId.__getitem__, self._vertices))
+        return relabeled
 
-    def __init__(self, vertex, w=1) :
-        super().__init__(vertex)
-        self._w = w
+class _WeightedAdjacencyList(_AdjacencyList) :
 
-class _AdjListIter :
+    # _weights[i] is the weight of the edge to _vertices[i]
+    __slots__ = [ '_weights' ]
 
-    __slots__ = [ '_next' ]
+    def __init__(self) :
+        super().__init__()
+        self._weights = []
 
-    def __init__(self, adjlist) :
-        self._next = adjlist._first
-        
-    def __iter__(self) :
-        return self
-
-    def __next__(self) :
-        if self._next == None :
-            raise StopIteration
-        vertex = self._next._targetVertex
-        self._next = self._next._next
-        return vertex
-
-class _AdjListIterWithWeights(_AdjListIter) :
-
-    __slots__ = []
-
-    def __init__(self, adjlist) :
-        super().__init__(adjlist)
-
-    def __next__(self) :
-        if self._next == None :
-            raise StopIteration
-        vertex = self._next._targetVertex
-        w = self._next._w
-        self._next = self._next._next
-        return vertex, w
+    def add(self, vertex, w=1) :
+        self._vertices.append(vertex)
+        self._weights.append(w)
+
+    def iterWeighted(self) :
+        # iterates over (adjacent vertex, edge weight) pairs, while
+        # iterating the list directly gives just the adjacent vertices
+        return zip(self._vertices, self._weights)
+
+    def _relabeled(self, newId) :
+        relabeled = super()._relabeled(newId)
+        relabeled._weights = self._weights[:]
+        return relabeled
 
 
 
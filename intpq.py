@@ -9,21 +9,26 @@
 
 class PQInts :
 
-    __slots__ = [ '_minheap', '_index' ]
+    # The binary min heap is stored as two parallel lists, rather than a list of
+    # (element, priority) tuples: _keys[i] is the element at heap position i and
+    # _prios[i] is its priority.  _index[element] is the heap position of element,
+    # or -1 if it isn't in the PQ.
+    __slots__ = [ '_keys', '_prios', '_index' ]
     
     def __init__(self, n) :
         """Initializes an empty PQ, but configured to support
         integers in the interval [0,n) as the elements."""
         self._index = [ -1 for x in range(n) ]
-        self._minheap = []
+        self._keys = []
+        self._prios = []
 
     def size(self) :
         """Size of the PQ."""
-        return len(self._minheap)
+        return len(self._keys)
 
     def isEmpty(self) :
         """Returns True if PQ is empty and False otherwise."""
-        return len(self._minheap) == 0
+        return len(self._keys) == 0
 
     def insert(self, element, value) :
         """Adds an element to the PQ with a specified priority.
@@ -39,8 +44,9 @@ class PQInts :
         """
         if self._index[element] >= 0 :
             return False
-        position = len(self._minheap)
-        self._minheap.append((element, value))
+        position = len(self._keys)
+        self._keys.append(element)
+        self._prios.append(value)
         self._percolate_up(position)
         return True
 
@@ -53,10 +59,11 @@ class PQInts :
         Keyword arguments:
         pairs -- A list of 2-tuples of the form (element, value) where value is the priority of element.
         """
-        if len(pairs) >= len(self._minheap) :
-            for p in pairs :
-                if self._index[p[0]] < 0 :
-                    self._minheap.append(p)
+        if len(pairs) >= len(self._keys) :
+            for el,val in pairs :
+                if self._index[el] < 0 :
+                    self._keys.append(el)
+                    self._prios.append(val)
             self._heapify()
         else :
             for el,val in pairs :
@@ -65,15 +72,17 @@ class PQInts :
     def peekMin(self) :
         """Returns, but does not remove, the element with the minimum priority value."""
         
-        return self._minheap[0][0]
+        return self._keys[0]
 
     def extractMin(self) :
         """Removes and returns the element with minimum priority value."""
         
-        minElement = self._minheap[0][0]
-        oldLast = self._minheap.pop()
-        if len(self._minheap) > 0 :
-            self._minheap[0] = oldLast
+        minElement = self._keys[0]
+        lastKey = self._keys.pop()
+        lastPrio = self._prios.pop()
+        if len(self._keys) > 0 :
+            self._keys[0] = lastKey
+            self._prios[0] = lastPrio
             self._percolate_down(0)
         self._index[minElement] = -1
         return minElement
@@ -92,7 +101,7 @@ class PQInts :
         Keyword arguments:
         element -- The element
         """
-        return self._minheap[self._index[element]][1]
+        return self._prios[self._index[element]]
 
     def changePriority(self, element, value) :
         """Changes the priority of an element in the PQ.
@@ -109,72 +118,84 @@ class PQInts :
         if not self.contains(element) :
             return False
         position = self._index[element]
-        if self._minheap[position][1] > value :
-            self._minheap[position] = (element, value)
+        if self._prios[position] > value :
+            self._prios[position] = value
             self._percolate_up(position)
-        elif self._minheap[position][1] < value :
-            self._minheap[position] = (element, value)
+        elif self._prios[position] < value :
+            self._prios[position] = value
             self._percolate_down(position)
         return True
 
     
 
-    def _left(i) :
-        return 2*i+1
-
-    def _right(i) :
-        return 2*i+2
-
-    def _parent(i) :
-        return (i-1)//2
+    # The percolate methods bind the heap lists to locals, and compute parent and child
+    # positions inline (the parent of position i is (i-1)//2, and its left child is 2*i+1),
+    # since they are the inner loops of every PQ operation.
 
     def _heapify(self) :
-        start = len(self._minheap) // 2 - 1
+        start = len(self._keys) // 2 - 1
         for i in range(start, -1, -1) :
             self._percolate_down_no_index(i)
-        for i, p in enumerate(self._minheap) :
-            self._index[p[0]] = i
+        index = self._index
+        for i, el in enumerate(self._keys) :
+            index[el] = i
 
     def _percolate_up(self, position) :
-        current = self._minheap[position]
-        p = PQInts._parent(position)
-        while p >= 0 and self._minheap[p][1] > current[1] :
-            self._minheap[position] = self._minheap[p]
-            self._index[self._minheap[position][0]] = position 
+        keys, prios, index = self._keys, self._prios, self._index
+        currentKey = keys[position]
+        currentPrio = prios[position]
+        p = (position - 1) // 2
+        while p >= 0 and prios[p] > currentPrio :
+            key = keys[p]
+            keys[position] = key
+            prios[position] = prios[p]
+            index[key] = position
             position = p
-            p = PQInts._parent(position)
-        self._minheap[position] = current
-        self._index[self._minheap[position][0]] = position
+            p = (position - 1) // 2
+        keys[position] = currentKey
+        prios[position] = currentPrio
+        index[currentKey] = position
 
     def _percolate_down(self, position) :
-        minChildPos = PQInts._left(position)
-        current = self._minheap[position]
-        while minChildPos < len(self._minheap) :
-            if minChildPos + 1 < len(self._minheap) and self._minheap[minChildPos + 1][1] < self._minheap[minChildPos][1] :
+        keys, prios, index = self._keys, self._prios, self._index
+        n = len(keys)
+        minChildPos = 2 * position + 1
+        currentKey = keys[position]
+        currentPrio = prios[position]
+        while minChildPos < n :
+            if minChildPos + 1 < n and prios[minChildPos + 1] < prios[minChildPos] :
                 minChildPos = minChildPos + 1
-            if self._minheap[minChildPos][1] < current[1] :
-                self._minheap[position] = self._minheap[minChildPos]
-                self._index[self._minheap[position][0]] = position
+            if prios[minChildPos] < currentPrio :
+                key = keys[minChildPos]
+                keys[position] = key
+                prios[position] = prios[minChildPos]
+                index[key] = position
                 position = minChildPos
-                minChildPos = PQInts._left(position)
+                minChildPos = 2 * position + 1
             else :        
                  break
-        self._minheap[position] = current
-        self._index[self._minheap[position][0]] = position
+        keys[position] = currentKey
+        prios[position] = currentPrio
+        index[currentKey] = position
 
     def _percolate_down_no_index(self, position) :
-        minChildPos = PQInts._left(position)
-        current = self._minheap[position]
-        while minChildPos < len(self._minheap) :
-            if minChildPos + 1 < len(self._minheap) and self._minheap[minChildPos + 1][1] < self._minheap[minChildPos][1] :
+        keys, prios = self._keys, self._prios
+        n = len(keys)
+        minChildPos = 2 * position + 1
+        currentKey = keys[position]
+        currentPrio = prios[position]
+        while minChildPos < n :
+            if minChildPos + 1 < n and prios[minChildPos + 1] < prios[minChildPos] :
                 minChildPos = minChildPos + 1
-            if self._minheap[minChildPos][1] < current[1] :
-                self._minheap[position] = self._minheap[minChildPos]
+            if prios[minChildPos] < currentPrio :
+                keys[position] = keys[minChildPos]
+                prios[position] = prios[minChildPos]
                 position = minChildPos
-                minChildPos = PQInts._left(position)
+                minChildPos = 2 * position + 1
             else :        
                  break
-        self._minheap[position] = current
+        keys[position] = currentKey
+        prios[position] = currentPrio
 
 
 